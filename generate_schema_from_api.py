@@ -2,19 +2,24 @@ import requests
 import sys
 import os
 import vdf
-import json
-import shutil
-import yaml
-from dotenv import load_dotenv, set_key
-import re
+from dotenv import load_dotenv, set_key, unset_key
 import platform
 from pathlib import Path
 import socket
+import subprocess
+import time
+import random
+import hashlib
+import threading
+from functools import lru_cache
+from contextlib import suppress
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from itertools import chain
 from rich.console import Console
 from rich.table import Table
 
 # --- FIX: Removed 'import sls_manager' to prevent circular import ---
-from shared_utils import read_cache, write_cache, get_app_details, get_env_value
+from shared_utils import read_cache, write_cache, iter_app_details, get_env_value, parse_json, dump_json, session, HTTP_TIMEOUT, HTTP_POOL_SIZE, read_yaml_file, open_atomic
 
 # --- Rich Console Initialization ---
 console = Console()
@@ -22,30 +27,99 @@ console = Console()
 # --- Constants ---
 DOTENV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
 DEFAULT_OUTPUT_DIR = os.path.expanduser("~/.steam/steam/appcache/stats")
+# Joined once: per-App-ID paths are built by plain concatenation onto this prefix.
+OUTPUT_PATH_PREFIX = os.path.join(DEFAULT_OUTPUT_DIR, "")
+STATS_TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'UserGameStats_steamid_appid.bin')
 SLSSTEAM_CONFIG_PATH = os.path.expanduser("~/.config/SLSsteam/config.yaml")
+if platform.system() == "Windows":
+    STEAM_LIBRARY_FILE = Path("C:/Program Files (x86)/Steam/steamapps/libraryfolders.vdf")
+else:
+    STEAM_LIBRARY_FILE = Path.home() / ".local/share/Steam/steamapps/libraryfolders.vdf"
+SCHEMA_CACHE_DIR = os.path.expanduser("~/.cache/SLSsteam/schemas")
+SCHEMA_CACHE_TTL = 7 * 86400
+# Matches the shared session's connection pool, so no worker has to open a fresh TLS connection.
+MAX_FETCH_WORKERS = HTTP_POOL_SIZE
+SCHEMA_API_URL = "https://api.steampowered.com/ISteamUserStats/GetSchemaForGame/v2/"
+MAX_IN_FLIGHT = MAX_FETCH_WORKERS * 2
+MAX_DELETE_WORKERS = min(16, (os.cpu_count() or 1) * 4)
+# Write buffer for the VDF encoder: its many small token writes become a few write syscalls.
+WRITE_BUFFER_SIZE = 1 << 20
+# Steam throttles Web API keys per minute; a full minute's worth may go out as one burst.
+API_RATE_PER_SEC = 200 / 60
+API_BURST = 200
+STEAMID64_BASE = 76561197960265728
+SUMMARY_ROWS = (
+    ("Total Games Processed", 'total'),
+    ("Files Updated/Created", 'updated'),
+    ("Files Overwritten", 'overwritten'),
+    ("Files Skipped", 'skipped'),
+)
+BATCH_MODE_MENU_TEXT = "\n".join((
+    "\n[bold]How do you want to handle existing files?[/bold]",
+    "1. Ask for each game (compares for new achievements)",
+    "2. Overwrite all",
+    "3. Update all (merge new achievements without asking)",
+    "4. Generate for new apps only",
+    "b. Back to main menu",
+))
+PURGE_MENU_TEXT = "\n".join((
+    "\n[bold]--- Purge Generated Files Menu ---[/bold]",
+    "1. Purge by manual App ID",
+    "2. Purge based on SLSsteam config",
+    "3. Purge based on Steam library",
+    "4. Purge ALL generated files",
+    "b. Back to main menu",
+))
+
+# --- API rate limiting (token bucket shared by all fetch workers) ---
+_bucket_lock = threading.Lock()
+_bucket = {'tokens': API_BURST, 'stamp': time.monotonic()}
+
+def acquire_api_token():
+    """Blocks until a Steam Web API request fits within the per-key rate limit."""
+    with _bucket_lock:
+        now = time.monotonic()
+        tokens = min(API_BURST, _bucket['tokens'] + (now - _bucket['stamp']) * API_RATE_PER_SEC) - 1
+        _bucket['tokens'], _bucket['stamp'] = tokens, now
+    # A negative balance is a reservation: sleep until that token has been refilled.
+    if tokens < 0:
+        time.sleep(-tokens / API_RATE_PER_SEC)
 
 def clear():
-    """Clears the console screen."""
-    console.clear()
-
-def check_internet_connection(host="8.8.8.8", port=53, timeout=3):
-    """Check for internet connectivity."""
-    try:
-        socket.setdefaulttimeout(timeout)
-        socket.socket(socket.AF_INET, socket.SOCK_STREAM).connect((host, port))
-        return True
-    except socket.error:
-        console.print("[bold red]No internet connection. Please check your network settings.[/bold red]")
-        return False
+    """Clears the console screen (a no-op when output is piped or redirected)."""
+    if console.is_terminal: console.clear()
+
+def start_internet_check(host="api.steampowered.com", port=443, timeout=3):
+    """Starts a background connectivity probe; returns a function that waits (bounded) for its result."""
+    done = threading.Event()
+    result = [False]
+    def probe():
+        try:
+            with socket.create_connection((host, port), timeout=timeout): result[0] = True
+        except OSError:
+            pass
+        finally:
+            done.set()
+    # create_connection's timeout doesn't cover the DNS lookup, so the wait is capped here;
+    # a daemon thread stuck in a hung resolver can't hold up exit either.
+    threading.Thread(target=probe, daemon=True).start()
+    return lambda: done.wait(timeout * 2) and result[0]
 
 def deep_merge(source, destination):
-    """Recursively merges two dictionaries."""
-    for key, value in source.items():
-        if isinstance(value, dict):
-            node = destination.setdefault(key, {})
-            deep_merge(value, node)
-        else:
-            destination[key] = value
+    """Merges source into destination in place, walking nested dicts with an explicit stack."""
+    stack = [(source, destination)]
+    push, pop = stack.append, stack.pop
+    while stack:
+        src, dst = pop()
+        dst_get = dst.get
+        for key, value in src.items():
+            # Parsed VDF and freshly built schemas are plain dicts, so an exact type check suffices.
+            if type(value) is dict:
+                existing = dst_get(key)
+                if type(existing) is dict:
+                    push((value, existing))
+                    continue
+            dst[key] = value
     return destination
 
 def get_achievement_names_from_schema(schema, app_id):
@@ -61,150 +135,460 @@ def get_achievement_names_from_schema(schema, app_id):
         pass
     return names
 
-def get_game_schema(api_key, steam_id, app_id, summary, language, batch_mode='ask'):
-    """Fetches the game schema from the Steam Web API and processes it."""
+def validate_api_key(api_key, steam_id):
+    """Checks the API key with one cheap call; returns False only if Steam rejects it."""
+    # STEAM_USER_ID is usually stored as the 32-bit account ID; the endpoint wants a SteamID64.
+    steam_id64 = int(steam_id) + STEAMID64_BASE if steam_id.isdigit() and int(steam_id) < STEAMID64_BASE else steam_id
+    url = f"https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v2/?key={api_key}&steamids={steam_id64}"
     try:
-        url = f"https://api.steampowered.com/ISteamUserStats/GetSchemaForGame/v2/?key={api_key}&appid={app_id}&l={language}"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        # A single attempt, not the shared session: its retries would hold up startup during
+        # a Steam outage, and an unreachable API is treated as a valid key anyway.
+        response = requests.get(url, timeout=5)
+    except requests.exceptions.RequestException:
+        return True
+    return response.status_code not in (401, 403)
+
+def read_cached_schema(app_id, language, revalidate=False):
+    """Returns (content, validators, is_fresh) for a cached API response, or None on a cache miss."""
+    cache_path = os.path.join(SCHEMA_CACHE_DIR, f"{app_id}_{language}.json")
+    try:
+        with open(cache_path, 'rb') as f:
+            # Entries live for 7 days plus a stable per-app offset of 1-7 days, so they don't all expire together.
+            max_age = SCHEMA_CACHE_TTL + random.Random(str(app_id)).randint(1, 7) * 86400
+            is_fresh = time.time() - os.fstat(f.fileno()).st_mtime <= max_age
+            content = f.read()
+    except OSError:
+        return None
+    validators = {}
+    if revalidate or not is_fresh:
+        # Validators only matter for revalidation, so a plain fresh hit never opens the sidecar.
+        try:
+            with open(f"{cache_path}.meta", 'rb') as f: validators = parse_json(f.read())
+        except (OSError, ValueError):
+            pass
+    return content, validators, is_fresh
+
+def write_cached_schema(app_id, language, content, headers):
+    """Atomically stores a raw API response and its cache validators. Failures are ignored."""
+    cache_path = os.path.join(SCHEMA_CACHE_DIR, f"{app_id}_{language}.json")
+    validators = {}
+    if headers.get('ETag'): validators['If-None-Match'] = headers['ETag']
+    if headers.get('Last-Modified'): validators['If-Modified-Since'] = headers['Last-Modified']
+    try:
+        os.makedirs(SCHEMA_CACHE_DIR, exist_ok=True)
+        with open_atomic(cache_path) as f: f.write(content)
+        with open_atomic(f"{cache_path}.meta") as f: f.write(dump_json(validators))
+    except OSError:
+        pass
+
+# Payload sizes of the fixed-width binary VDF value types (int32, float32, pointer, color, uint64, int64).
+_VDF_FIXED_SIZES = {0x02: 4, 0x03: 4, 0x04: 4, 0x06: 4, 0x07: 8, 0x0A: 8}
+
+def iter_schema_names(buf, app_id):
+    """Yields the achievement API names of a binary VDF schema without decoding it into dicts."""
+    find = buf.find
+    root = str(app_id).encode()
+    path = []
+    pos, length = 0, len(buf)
+    while pos < length:
+        t = buf[pos]
+        pos += 1
+        if t == 0x08:
+            if not path:
+                return
+            path.pop()
+            continue
+
+        key_end = find(b'\x00', pos)
+        if key_end == -1:
+            raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+        key_start, pos = pos, key_end + 1
+
+        if t == 0x00:
+            path.append(buf[key_start:key_end])
+        elif t == 0x01:
+            end = find(b'\x00', pos)
+            if end == -1:
+                raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+            if (len(path) == 5 and path[3] == b'bits' and path[1] == b'stats' and path[0] == root
+                    and buf[key_start:key_end] == b'name'):
+                yield buf[pos:end].decode('utf-8', 'replace')
+            pos = end + 1
+        elif t == 0x05:
+            end = find(b'\x00\x00', pos)
+            if end == -1:
+                raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+            pos = end + (end - pos) % 2 + 2
+        elif t in _VDF_FIXED_SIZES:
+            pos += _VDF_FIXED_SIZES[t]
+        else:
+            raise SyntaxError("Unknown data type at offset %d: %r" % (pos - 1, t))
+    if path:
+        raise SyntaxError("Reached EOF, but Binary VDF is incomplete")
+
+def load_existing_achievement_names(schema_filename, app_id, content=None):
+    """Reads the achievement names of a schema file (or of its bytes, if given)."""
+    if content is None:
+        with open(schema_filename, 'rb') as f: content = f.read()
+    return set(iter_schema_names(content, app_id))
+
+def achievement_names_digest(names):
+    """Returns a short, order-independent digest of a set of achievement API names."""
+    return hashlib.blake2b('\n'.join(sorted(names)).encode(), digest_size=16).hexdigest()
+
+def read_names_digest(app_id, schema_filename):
+    """Returns the recorded achievement-name digest for a schema file, or None if the file has changed."""
+    try:
+        with open(os.path.join(SCHEMA_CACHE_DIR, f"{app_id}.names"), 'r') as f: digest, size, mtime_ns = f.read().split()
+        st = os.stat(schema_filename)
+        if int(size) == st.st_size and int(mtime_ns) == st.st_mtime_ns:
+            return digest
+    except (OSError, ValueError):
+        pass
+    return None
+
+def write_names_digest(app_id, schema_filename, digest):
+    """Records the achievement-name digest for a schema file we just wrote or decoded. Failures are ignored."""
+    try:
+        st = os.stat(schema_filename)
+        os.makedirs(SCHEMA_CACHE_DIR, exist_ok=True)
+        with open_atomic(os.path.join(SCHEMA_CACHE_DIR, f"{app_id}.names")) as f:
+            f.write(f"{digest} {st.st_size} {st.st_mtime_ns}".encode())
+    except OSError:
+        pass
+
+def fetch_schema(api_key, app_id, language, revalidate=False):
+    """Fetches the raw game schema JSON for an App ID, from the local cache or the Steam Web API."""
+    cached = read_cached_schema(app_id, language, revalidate)
+    content, validators, is_fresh = cached if cached is not None else (None, {}, False)
+    if is_fresh and not revalidate:
+        with suppress(ValueError): return parse_json(content)
+
+    params = {'key': api_key, 'appid': app_id, 'l': language}
+    acquire_api_token()
+    response = session.get(SCHEMA_API_URL, params=params, headers=validators, timeout=HTTP_TIMEOUT)
+    if response.status_code == 304 and content is not None:
+        # Unchanged upstream: restart the entry's TTL and reuse the stored body.
+        with suppress(OSError): os.utime(os.path.join(SCHEMA_CACHE_DIR, f"{app_id}_{language}.json"))
+        with suppress(ValueError): return parse_json(content)
+        acquire_api_token()
+        response = session.get(SCHEMA_API_URL, params=params, timeout=HTTP_TIMEOUT)
+    response.raise_for_status()
+    try:
+        data = parse_json(response.content)
+    except ValueError as e:
+        raise requests.exceptions.JSONDecodeError(str(e), response.text, 0) from e
+    write_cached_schema(app_id, language, response.content, response.headers)
+    return data
+
+def report_schema_error(app_id, error, summary):
+    """Prints a user-friendly message for a failed schema fetch and counts it as an error."""
+    if isinstance(error, requests.exceptions.HTTPError):
+        if error.response.status_code == 401:
+            console.print(f"[bold red]Error processing App ID {app_id}: Unauthorized. Your Steam API Key may be invalid.[/bold red]")
+        elif error.response.status_code == 404:
+            console.print(f"[bold red]Error processing App ID {app_id}: Not Found. The game might not exist or is incorrect.[/bold red]")
+        else:
+            console.print(f"[bold red]Error processing App ID {app_id}: HTTP Error {error.response.status_code}[/bold red]")
+    else:
+        console.print(f"[bold red]Error processing App ID {app_id}: {error}[/bold red]")
+    summary['errors'] += 1
+    return False
+
+@lru_cache(maxsize=None)
+def read_stats_template():
+    """Reads the blank UserGameStats template once; every new stats file gets the same bytes."""
+    with open(STATS_TEMPLATE_PATH, 'rb') as f: return f.read()
+
+# Bit keys of a 32-bit stats block, converted to strings once instead of per achievement.
+_BIT_KEYS = tuple(str(bit_id) for bit_id in range(32))
+
+def build_stats_block(block_id, achievements, language):
+    """Builds one 32-bit achievement stats block; the bits dict is made in a single comprehension."""
+    token_prefix = f"NEW_ACHIEVEMENT_{block_id}_"
+    return {"type": "4", "id": block_id, "bits": {
+        bit_key: {
+            "name": ach['name'], "bit": bit_id,
+            "display": {
+                "name": {language: ach['displayName'], "token": f"{token_prefix}{bit_key}_NAME"},
+                "desc": {language: ach.get('description', ''), "token": f"{token_prefix}{bit_key}_DESC"},
+                "hidden": str(ach['hidden']), "icon": ach['icon'].rpartition('/')[2], "icon_gray": ach['icongray'].rpartition('/')[2]
+            }
+        } for bit_id, bit_key, ach in zip(range(32), _BIT_KEYS, achievements)
+    }}
+
+def list_output_files():
+    """Creates the output directory if needed and returns the set of stats file names already in it."""
+    os.makedirs(DEFAULT_OUTPUT_DIR, exist_ok=True)
+    with os.scandir(DEFAULT_OUTPUT_DIR) as entries:
+        return {e.name for e in entries if e.name.startswith('UserGameStats') and e.name.endswith('.bin')}
+
+def write_schema(data, steam_id, app_id, summary, language, batch_mode='ask', existing_files=None):
+    """Builds the schema from fetched API data and writes the schema/stats files to disk."""
+    if existing_files is None:
+        existing_files = list_output_files()
+
+    # Per-app progress lines are collected and printed as one block; they are flushed
+    # early only when the user has to be prompted.
+    messages = []
+    def flush_messages():
+        if messages:
+            console.print("\n".join(messages))
+            messages.clear()
 
+    try:
         if not data.get('game'):
             console.print(f"[bold red]Error processing App ID {app_id}:[/bold red] No game data in response. The App ID might be invalid or not released.")
             summary['errors'] += 1
             return False
 
-        game_name = data['game']['gameName']
-        console.print(f"--- Processing [bold cyan]{game_name}[/bold cyan] ({app_id}) ---")
+        game = data['game']
+        game_name = game['gameName']
+        messages.append(f"--- Processing [bold cyan]{game_name}[/bold cyan] ({app_id}) ---")
+
+        # Achievements are packed 32 to a stats block.
+        achievements = (game.get('availableGameStats') or {}).get('achievements') or ()
+        blocks = [achievements[offset:offset + 32] for offset in range(0, len(achievements), 32)]
+        stats = {str(block_id): build_stats_block(str(block_id), block, language) for block_id, block in enumerate(blocks, 1)}
 
         new_schema = {
             app_id: {
                 "gamename": game_name,
-                "version": data['game']['gameVersion'],
-                "stats": {}
+                "version": game['gameVersion'],
+                "stats": stats
             }
         }
-        if 'availableGameStats' in data['game'] and 'achievements' in data['game']['availableGameStats']:
-            achievements = data['game']['availableGameStats']['achievements']
-            for i, ach in enumerate(achievements):
-                block_id = (i // 32) + 1
-                bit_id = i % 32
-                if str(block_id) not in new_schema[app_id]["stats"]:
-                    new_schema[app_id]["stats"][str(block_id)] = {"type": "4", "id": str(block_id), "bits": {}}
-                new_schema[app_id]["stats"][str(block_id)]["bits"][str(bit_id)] = {
-                    "name": ach['name'], "bit": bit_id,
-                    "display": {
-                        "name": {language: ach['displayName'], "token": f"NEW_ACHIEVEMENT_{block_id}_{bit_id}_NAME"},
-                        "desc": {language: ach.get('description', ''), "token": f"NEW_ACHIEVEMENT_{block_id}_{bit_id}_DESC"},
-                        "hidden": str(ach['hidden']), "icon": ach['icon'].split('/')[-1], "icon_gray": ach['icongray'].split('/')[-1]
-                    }
-                }
-        
-        if not os.path.exists(DEFAULT_OUTPUT_DIR):
-            os.makedirs(DEFAULT_OUTPUT_DIR)
-            
-        schema_filename = os.path.join(DEFAULT_OUTPUT_DIR, f"UserGameStatsSchema_{app_id}.bin")
+
+        schema_name = f"UserGameStatsSchema_{app_id}.bin"
+        schema_filename = OUTPUT_PATH_PREFIX + schema_name
         action = 'ask' if batch_mode == 'ask' else batch_mode
 
-        if os.path.exists(schema_filename):
+        new_ach_names = get_achievement_names_from_schema(new_schema, app_id)
+        new_names_digest = achievement_names_digest(new_ach_names)
+
+        if schema_name in existing_files:
+            # Bytes read for the name comparison are kept so an 'update' doesn't read the file twice.
+            existing_bytes = None
             if action == 'ask':
                 try:
-                    with open(schema_filename, 'rb') as f: existing_schema = vdf.binary_load(f)
-                    existing_ach_names = get_achievement_names_from_schema(existing_schema, app_id)
-                    new_ach_names = get_achievement_names_from_schema(new_schema, app_id)
-                    new_achievements = new_ach_names - existing_ach_names
-                    
+                    if read_names_digest(app_id, schema_filename) == new_names_digest:
+                        # Same achievement names as the file we last wrote/compared: no need to decode it.
+                        new_achievements = set()
+                    else:
+                        with open(schema_filename, 'rb') as f: existing_bytes = f.read()
+                        existing_ach_names = load_existing_achievement_names(schema_filename, app_id, existing_bytes)
+                        write_names_digest(app_id, schema_filename, achievement_names_digest(existing_ach_names))
+                        new_achievements = new_ach_names - existing_ach_names
+
                     if not new_achievements:
-                        console.print("[green]Schema is already up-to-date. No new achievements found.[/green]")
+                        messages.append("[green]Schema is already up-to-date. No new achievements found.[/green]")
                         action = 'skip'
                     else:
-                        console.print(f"[yellow]Found {len(new_achievements)} new achievement(s).[/yellow]")
+                        messages.append(f"[yellow]Found {len(new_achievements)} new achievement(s).[/yellow]")
+                        flush_messages()
                         choice = console.input("Would you like to [1] Update (merge), [2] Overwrite, or [3] Skip? ")
                         if choice == '1': action = 'update'
                         elif choice == '2': action = 'overwrite'
                         else: action = 'skip'
                 except Exception as e:
-                    console.print(f"[bold red]Could not compare schema files: {e}[/bold red]")
+                    messages.append(f"[bold red]Could not compare schema files: {e}[/bold red]")
+                    flush_messages()
                     choice = console.input(f"'{os.path.basename(schema_filename)}' already exists. [1] Overwrite, [2] Update, [3] Skip? ")
                     if choice == '1': action = 'overwrite'
                     elif choice == '2': action = 'update'
                     else: action = 'skip'
             
             if action == 'overwrite':
-                with open(schema_filename, 'wb') as f: f.write(vdf.binary_dumps(new_schema))
-                console.print(f"[green]Successfully overwrote schema file.[/green]")
+                with open_atomic(schema_filename, WRITE_BUFFER_SIZE) as f: vdf.binary_dump(new_schema, f)
+                write_names_digest(app_id, schema_filename, new_names_digest)
+                messages.append(f"[green]Successfully overwrote schema file.[/green]")
                 summary['overwritten'] += 1
             elif action == 'update':
-                with open(schema_filename, 'rb') as f: existing_schema = vdf.binary_load(f)
-                merged_schema = deep_merge(new_schema, existing_schema)
-                with open(schema_filename, 'wb') as f: f.write(vdf.binary_dumps(merged_schema))
-                console.print(f"[green]Successfully updated schema file.[/green]")
+                if existing_bytes is None:
+                    with open(schema_filename, 'rb') as f: existing_bytes = f.read()
+                if existing_bytes.endswith(vdf.BIN_END) and vdf.BIN_NONE + app_id.encode() + vdf.BIN_NONE not in existing_bytes:
+                    # No entry for this App ID yet, so the merge is a plain union of top-level keys:
+                    # splice the new entry in before the root terminator instead of decoding the file.
+                    with open_atomic(schema_filename, WRITE_BUFFER_SIZE) as f:
+                        f.write(memoryview(existing_bytes)[:-1])
+                        vdf.binary_dump(new_schema, f)
+                else:
+                    # A real merge is kept (not a plain replace of the App ID entry): achievements that
+                    # only exist in the file, e.g. ones since removed upstream, must survive an update.
+                    merged_schema = deep_merge(new_schema, vdf.binary_loads(existing_bytes, raise_on_remaining=False))
+                    merged_bytes = vdf.binary_dumps(merged_schema)
+                    if merged_bytes != existing_bytes:
+                        with open_atomic(schema_filename) as f: f.write(merged_bytes)
+                    write_names_digest(app_id, schema_filename, achievement_names_digest(get_achievement_names_from_schema(merged_schema, app_id)))
+                messages.append(f"[green]Successfully updated schema file.[/green]")
                 summary['updated'] += 1
             elif action == 'skip':
-                console.print("[yellow]Skipped schema file.[/yellow]")
+                messages.append("[yellow]Skipped schema file.[/yellow]")
                 summary['skipped'] += 1
         else:
-            with open(schema_filename, 'wb') as f: f.write(vdf.binary_dumps(new_schema))
-            console.print(f"[green]Successfully created new schema file: {os.path.basename(schema_filename)}[/green]")
+            with open_atomic(schema_filename, WRITE_BUFFER_SIZE) as f: vdf.binary_dump(new_schema, f)
+            write_names_digest(app_id, schema_filename, new_names_digest)
+            existing_files.add(schema_name)
+            messages.append(f"[green]Successfully created new schema file: {schema_name}[/green]")
             summary['updated'] += 1
 
-        stats_dest_filename = os.path.join(DEFAULT_OUTPUT_DIR, f"UserGameStats_{steam_id}_{app_id}.bin")
-        if not os.path.exists(stats_dest_filename):
-            stats_template_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'UserGameStats_steamid_appid.bin')
-            shutil.copy(stats_template_path, stats_dest_filename)
-            console.print(f"[green]Successfully created stats file: {os.path.basename(stats_dest_filename)}[/green]")
+        stats_name = f"UserGameStats_{steam_id}_{app_id}.bin"
+        if stats_name not in existing_files:
+            existing_files.add(stats_name)
+            # The listing may be stale (Steam can create the file meanwhile), so create it
+            # exclusively: real achievement progress must never be replaced by the template.
+            try:
+                fd = os.open(OUTPUT_PATH_PREFIX + stats_name, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+            except FileExistsError:
+                pass
+            else:
+                with open(fd, 'wb') as f: f.write(read_stats_template())
+                messages.append(f"[green]Successfully created stats file: {stats_name}[/green]")
 
         summary['total'] += 1
         return True
 
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 401:
-            console.print(f"[bold red]Error processing App ID {app_id}: Unauthorized. Your Steam API Key may be invalid.[/bold red]")
-        elif e.response.status_code == 404:
-            console.print(f"[bold red]Error processing App ID {app_id}: Not Found. The game might not exist or is incorrect.[/bold red]")
-        else:
-            console.print(f"[bold red]Error processing App ID {app_id}: HTTP Error {e.response.status_code}[/bold red]")
-        summary['errors'] += 1
-        return False
-    except (requests.exceptions.RequestException, KeyError, FileNotFoundError) as e:
-        console.print(f"[bold red]Error processing App ID {app_id}: {e}[/bold red]")
-        summary['errors'] += 1
+    except (KeyError, FileNotFoundError) as e:
+        flush_messages()
+        return report_schema_error(app_id, e, summary)
+    finally:
+        flush_messages()
+
+def skip_existing_schema(app_id, existing_files, summary):
+    """Returns True (and counts a skip) if a schema for app_id is already on disk."""
+    if f"UserGameStatsSchema_{app_id}.bin" not in existing_files:
         return False
+    console.print(f"[yellow]Schema for {app_id} already exists, skipping.[/yellow]")
+    summary['skipped'] += 1
+    return True
 
-def parse_libraryfolders_vdf():
-    """Parse libraryfolders.vdf to extract app IDs"""
-    if platform.system() == "Windows":
-        STEAM_DIR = Path("C:/Program Files (x86)/Steam")
-    else:
-        STEAM_DIR = Path.home() / ".local/share/Steam"
-    LIBRARY_FILE = STEAM_DIR / "steamapps/libraryfolders.vdf"
+def get_game_schema(api_key, steam_id, app_id, summary, language, batch_mode='ask', existing_files=None):
+    """Fetches the game schema from the Steam Web API and processes it."""
+    # Modes that replace files on disk check even fresh cache entries with Steam.
+    revalidate = batch_mode in ('overwrite', 'update')
+    if batch_mode == 'generate_new':
+        if existing_files is None:
+            existing_files = list_output_files()
+        if skip_existing_schema(app_id, existing_files, summary):
+            return False
+        batch_mode = 'overwrite'
+    try:
+        data = fetch_schema(api_key, app_id, language, revalidate)
+    except requests.exceptions.RequestException as e:
+        return report_schema_error(app_id, e, summary)
+    return write_schema(data, steam_id, app_id, summary, language, batch_mode, existing_files)
+
+def process_app_ids(api_key, steam_id, app_ids, summary, language, batch_mode, status):
+    """Processes an iterable of App IDs, overlapping the HTTP requests on a thread pool."""
+    existing_files = list_output_files()
+    revalidate = batch_mode in ('overwrite', 'update')
+    if batch_mode == 'generate_new':
+        missing = (app_id for app_id in app_ids if not skip_existing_schema(app_id, existing_files, summary))
+        app_ids, batch_mode = missing, 'overwrite'
+
+    if batch_mode == 'ask':
+        for app_id in app_ids:
+            status.update(f"Processing App ID: {app_id}")
+            get_game_schema(api_key, steam_id, str(app_id), summary, language, batch_mode, existing_files)
+        return
 
-    if not LIBRARY_FILE.exists():
-        console.print(f"[yellow]Steam library file not found at {LIBRARY_FILE}[/yellow]")
-        return []
+    # At most MAX_IN_FLIGHT fetches are queued at once, and responses are written in the order
+    # they complete: one slow App ID never holds up writing the ones that arrived after it.
+    in_flight = {}
+
+    def write_completed(future):
+        app_id = in_flight.pop(future)
+        status.update(f"Processing App ID: {app_id}")
+        try:
+            data = future.result()
+        except requests.exceptions.RequestException as e:
+            report_schema_error(app_id, e, summary)
+            return
+        write_schema(data, steam_id, app_id, summary, language, batch_mode, existing_files)
 
-    console.print(f"Reading Steam library from: [cyan]{LIBRARY_FILE}[/cyan]")
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        for app_id in app_ids:
+            in_flight[executor.submit(fetch_schema, api_key, app_id, language, revalidate)] = str(app_id)
+            if len(in_flight) >= MAX_IN_FLIGHT:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    write_completed(future)
+        for future in as_completed(list(in_flight)):
+            write_completed(future)
+
+def iter_library_app_ids(seen=None):
+    """Yields each unique App ID from libraryfolders.vdf as soon as its line is read."""
     try:
-        with open(LIBRARY_FILE, 'r') as f: data = vdf.load(f)
-        app_ids = set()
+        f = STEAM_LIBRARY_FILE.open('rb', buffering=65536)
+    except FileNotFoundError:
+        console.print(f"[yellow]Steam library file not found at {STEAM_LIBRARY_FILE}[/yellow]")
+        return
+
+    console.print(f"Reading Steam library from: [cyan]{STEAM_LIBRARY_FILE}[/cyan]")
+    seen = set() if seen is None else seen
+    apps_found = False
+    in_apps = False
+    depth = 0  # brace depth inside the current "apps" block
+    expect_key = True
+    # Stream line by line and only look at "apps" blocks, which hold flat
+    # '"<appid>" "<size>"' pairs; the rest of the file is skipped. Lines stay as bytes,
+    # so library paths are never decoded.
+    with f:
+        for line in f:
+            token = line.strip()
+            if not in_apps and b'"apps"' not in token:
+                continue
+            if in_apps and depth == 1 and token.startswith(b'"') and b'{' not in token and b'}' not in token:
+                # Steam's usual layout: one pair per line.
+                key = token[1:token.find(b'"', 1)]
+                app_ids = (key,)
+            else:
+                # Anything else (braces, or several tokens on one line) is split into tokens.
+                # Keys and values inside "apps" are plain numbers, so whitespace splitting is enough.
+                app_ids = []
+                for part in token.replace(b'{', b' { ').replace(b'}', b' } ').split():
+                    if not in_apps:
+                        if part == b'"apps"':
+                            in_apps, depth, expect_key, apps_found = True, 0, True, True
+                    elif part == b'{':
+                        depth += 1
+                        expect_key = True
+                    elif part == b'}':
+                        depth -= 1
+                        expect_key = True
+                        if depth <= 0: in_apps = False
+                    elif depth == 1:
+                        if expect_key: app_ids.append(part.strip(b'"'))
+                        expect_key = not expect_key
+            for key in app_ids:
+                if key.isdigit():
+                    app_id = int(key)
+                    if app_id not in seen:
+                        seen.add(app_id)
+                        yield app_id
+
+    if not apps_found:
+        # No "apps" block was recognised at all, so the file is in a layout the scanner
+        # doesn't know; fall back to a full VDF parse.
+        with STEAM_LIBRARY_FILE.open('r', encoding='utf-8', errors='replace') as f: data = vdf.load(f)
         for folder_data in data.get('libraryfolders', {}).values():
             if isinstance(folder_data, dict):
-                for app_id in folder_data.get('apps', {}).keys():
-                    if app_id.isdigit():
-                        app_ids.add(int(app_id))
-        return sorted(list(app_ids))
+                for key in folder_data.get('apps', {}):
+                    if key.isdigit() and int(key) not in seen:
+                        seen.add(int(key))
+                        yield int(key)
+
+def parse_libraryfolders_vdf():
+    """Parse libraryfolders.vdf to extract app IDs"""
+    try:
+        return sorted(iter_library_app_ids())
     except Exception as e:
         console.print(f"[bold red]Error parsing Steam library file (VDF parse): {e}[/bold red]")
         return []
 
 def get_batch_mode():
     """Gets the batch processing mode from the user."""
-    console.print("\n[bold]How do you want to handle existing files?[/bold]")
-    console.print("1. Ask for each game (compares for new achievements)")
-    console.print("2. Overwrite all")
-    console.print("3. Update all (merge new achievements without asking)")
-    console.print("4. Generate for new apps only")
-    console.print("b. Back to main menu")
+    console.print(BATCH_MODE_MENU_TEXT)
     choice = console.input("Select an option: ")
     if choice.lower() == 'b': return 'b'
     if choice == '2': return 'overwrite'
@@ -218,10 +602,8 @@ def print_summary(summary):
     table.add_column("Status", style="cyan")
     table.add_column("Count", style="magenta")
     
-    table.add_row("Total Games Processed", str(summary['total']))
-    table.add_row("Files Updated/Created", str(summary['updated']))
-    table.add_row("Files Overwritten", str(summary['overwritten']))
-    table.add_row("Files Skipped", str(summary['skipped']))
+    for label, key in SUMMARY_ROWS:
+        table.add_row(label, str(summary[key]))
     if summary['errors'] > 0:
         table.add_row("[bold red]Errors[/bold red]", f"[bold red]{summary['errors']}[/bold red]")
     else:
@@ -229,11 +611,15 @@ def print_summary(summary):
         
     console.print(table)
 
+def read_slssteam_config():
+    """Returns the parsed SLSsteam config, re-parsing the YAML only when the file has changed."""
+    return read_yaml_file(SLSSTEAM_CONFIG_PATH) or {}
+
 def handle_slssteam_list(api_key, steam_id, language):
     clear()
     summary = {'total': 0, 'overwritten': 0, 'updated': 0, 'skipped': 0, 'errors': 0}
     try:
-        with open(SLSSTEAM_CONFIG_PATH, 'r') as f: config = yaml.safe_load(f)
+        config = read_slssteam_config()
         app_ids = config.get('AdditionalApps', [])
         if not app_ids:
             console.print("[yellow]No App IDs found in SLSsteam config file.[/yellow]")
@@ -245,10 +631,7 @@ def handle_slssteam_list(api_key, steam_id, language):
         missing_ids = [app_id for app_id in app_ids if str(app_id) not in cache]
         if missing_ids:
             console.print(f"Found {len(missing_ids)} apps not in cache. Fetching details...")
-            cache_modified = False
-            for app_id in missing_ids:
-                _, modified = get_app_details(app_id, cache)
-                if modified: cache_modified = True
+            cache_modified = any([modified for _, modified in iter_app_details(missing_ids, cache)])
             if cache_modified:
                 write_cache(cache)
                 console.print("[green]Cache updated.[/green]")
@@ -260,19 +643,11 @@ def handle_slssteam_list(api_key, steam_id, language):
         if batch_mode is None or batch_mode == 'b': return
 
         with console.status("[bold green]Processing games...[/bold green]") as status:
-            for app_id in app_ids:
-                status.update(f"Processing App ID: {app_id}")
-                if batch_mode == 'generate_new':
-                    schema_filename = os.path.join(DEFAULT_OUTPUT_DIR, f"UserGameStatsSchema_{app_id}.bin")
-                    if os.path.exists(schema_filename):
-                        console.print(f"[yellow]Schema for {app_id} already exists, skipping.[/yellow]")
-                        summary['skipped'] += 1
-                        continue
-                get_game_schema(api_key, steam_id, str(app_id), summary, language, batch_mode if batch_mode != 'generate_new' else 'overwrite')
+            process_app_ids(api_key, steam_id, app_ids, summary, language, batch_mode, status)
 
     except FileNotFoundError:
         console.print(f"[bold red]Error: SLSsteam config file not found at {SLSSTEAM_CONFIG_PATH}[/bold red]")
-    except (yaml.YAMLError, Exception) as e:
+    except Exception as e:
         console.print(f"[bold red]An error occurred: {e}[/bold red]")
     
     print_summary(summary)
@@ -281,34 +656,46 @@ def handle_slssteam_list(api_key, steam_id, language):
 def handle_steam_library(api_key, steam_id, language):
     clear()
     summary = {'total': 0, 'overwritten': 0, 'updated': 0, 'skipped': 0, 'errors': 0}
-    app_ids = parse_libraryfolders_vdf()
-    if not app_ids:
+    found_ids = set()
+    try:
+        app_ids = iter_library_app_ids(found_ids)
+        first_id = next(app_ids, None)
+    except Exception as e:
+        console.print(f"[bold red]Error parsing Steam library file (VDF parse): {e}[/bold red]")
+        first_id = None
+    if first_id is None:
         console.print("[yellow]No App IDs found in Steam library.[/yellow]")
         console.input("\nPress Enter to return to the main menu.")
         return
 
-    console.print(f"Found {len(app_ids)} App IDs in Steam library.")
     batch_mode = get_batch_mode()
-    if batch_mode is None or batch_mode == 'b': return
+    if batch_mode is None or batch_mode == 'b':
+        app_ids.close()
+        return
 
-    with console.status("[bold green]Processing library...[/bold green]") as status:
-        for app_id in app_ids:
-            status.update(f"Processing App ID: {app_id}")
-            get_game_schema(api_key, steam_id, str(app_id), summary, language, batch_mode)
+    # The rest of the library is parsed lazily, so the first fetches overlap with the parse.
+    try:
+        with console.status("[bold green]Processing library...[/bold green]") as status:
+            process_app_ids(api_key, steam_id, chain([first_id], app_ids), summary, language, batch_mode, status)
+    except Exception as e:
+        console.print(f"[bold red]An error occurred: {e}[/bold red]")
 
+    console.print(f"Found {len(found_ids)} App IDs in Steam library.")
     print_summary(summary)
     console.input("\nPress Enter to return to the main menu.")
 
 def handle_manual_input(api_key, steam_id, language):
     clear()
     summary = {'total': 0, 'overwritten': 0, 'updated': 0, 'skipped': 0, 'errors': 0}
+    # One directory snapshot for the whole session; write_schema keeps it current as files are created.
+    existing_files = list_output_files()
     while True:
         app_id = console.input("\nEnter the App ID (or 'b' to return to main menu): ")
         if app_id.lower() == 'b': break
         if not app_id.isdigit():
             console.print("[bold red]Invalid App ID. Please enter a number.[/bold red]")
             continue
-        get_game_schema(api_key, steam_id, app_id, summary, language)
+        get_game_schema(api_key, steam_id, app_id, summary, language, existing_files=existing_files)
     
     if summary['total'] > 0:
         print_summary(summary)
@@ -329,24 +716,45 @@ def handle_clear_credentials():
     console.input("\nPress Enter to exit.")
 
 # ... (Rest of the file with console.print replacements) 
+def try_unlink(filepath):
+    """Removes one file, returning the OSError instead of raising it."""
+    try:
+        os.remove(filepath)
+        return None
+    except OSError as e:
+        return e
+
+def delete_files(files_to_delete):
+    """Deletes files in parallel, overlapping filesystem latency, and prints a summary."""
+    deleted_count = 0
+    error_count = 0
+    with ThreadPoolExecutor(max_workers=MAX_DELETE_WORKERS) as executor:
+        for filepath, error in zip(files_to_delete, executor.map(try_unlink, files_to_delete)):
+            if error is None:
+                deleted_count += 1
+            else:
+                console.print(f"[bold red]Error deleting file {filepath}: {error}[/bold red]")
+                error_count += 1
+
+    console.print(f"\n[green]Successfully deleted {deleted_count} files.[/green]")
+    if error_count > 0:
+        console.print(f"[bold red]Failed to delete {error_count} files.[/bold red]")
+
 def delete_files_for_appids(app_ids, steam_id, source_name):
     """Deletes schema and stats files for a given list of App IDs."""
     if not app_ids:
         console.print(f"[yellow]No App IDs found from {source_name} to purge.[/yellow]")
         return
 
+    existing_files = list_output_files() if os.path.isdir(DEFAULT_OUTPUT_DIR) else set()
     files_to_delete = []
     app_ids_found = set()
     for app_id in app_ids:
         app_id_str = str(app_id)
-        schema_file = os.path.join(DEFAULT_OUTPUT_DIR, f"UserGameStatsSchema_{app_id_str}.bin")
-        stats_file = os.path.join(DEFAULT_OUTPUT_DIR, f"UserGameStats_{steam_id}_{app_id_str}.bin")
-        if os.path.exists(schema_file):
-            files_to_delete.append(schema_file)
-            app_ids_found.add(app_id_str)
-        if os.path.exists(stats_file):
-            files_to_delete.append(stats_file)
-            app_ids_found.add(app_id_str)
+        for filename in (f"UserGameStatsSchema_{app_id_str}.bin", f"UserGameStats_{steam_id}_{app_id_str}.bin"):
+            if filename in existing_files:
+                files_to_delete.append(OUTPUT_PATH_PREFIX + filename)
+                app_ids_found.add(app_id_str)
 
     if not files_to_delete:
         console.print(f"[yellow]No generated files found for the App IDs from {source_name}.[/yellow]")
@@ -360,19 +768,7 @@ def delete_files_for_appids(app_ids, steam_id, source_name):
         console.print("\n[yellow]Purge operation cancelled.[/yellow]")
         return
 
-    deleted_count = 0
-    error_count = 0
-    for filepath in files_to_delete:
-        try:
-            os.remove(filepath)
-            deleted_count += 1
-        except OSError as e:
-            console.print(f"[bold red]Error deleting file {filepath}: {e}[/bold red]")
-            error_count += 1
-    
-    console.print(f"\n[green]Successfully deleted {deleted_count} files.[/green]")
-    if error_count > 0:
-        console.print(f"[bold red]Failed to delete {error_count} files.[/bold red]")
+    delete_files(files_to_delete)
 
 def handle_purge_manual(steam_id):
     clear()
@@ -389,7 +785,7 @@ def handle_purge_slssteam(steam_id):
     clear()
     console.print("[bold]--- Purge from SLSsteam config ---[/bold]")
     try:
-        with open(SLSSTEAM_CONFIG_PATH, 'r') as f: config = yaml.safe_load(f)
+        config = read_slssteam_config()
         app_ids = config.get('AdditionalApps', [])
         if app_ids:
             delete_files_for_appids(app_ids, steam_id, "SLSsteam config")
@@ -397,7 +793,7 @@ def handle_purge_slssteam(steam_id):
             console.print("[yellow]No App IDs found in SLSsteam config file.[/yellow]")
     except FileNotFoundError:
         console.print(f"[bold red]Error: SLSsteam config file not found at {SLSSTEAM_CONFIG_PATH}[/bold red]")
-    except (yaml.YAMLError, Exception) as e:
+    except Exception as e:
         console.print(f"[bold red]An error occurred: {e}[/bold red]")
     console.input("\nPress Enter to continue.")
 
@@ -411,6 +807,17 @@ def handle_purge_steam_library(steam_id):
         console.print("[yellow]Could not find any App IDs in the Steam library.[/yellow]")
     console.input("\nPress Enter to continue.")
 
+def is_generated_file_name(name):
+    """True for UserGameStatsSchema_<appid>.bin and UserGameStats_<steamid>_<appid>.bin names."""
+    if not name.endswith('.bin'):
+        return False
+    if name.startswith('UserGameStatsSchema_'):
+        return name[20:-4].isdigit()
+    if not name.startswith('UserGameStats_') or name.count('_') != 2:
+        return False
+    steam_id, _, app_id = name[14:-4].partition('_')
+    return steam_id.isdigit() and app_id.isdigit()
+
 def purge_all():
     clear()
     console.print("[bold]--- Purge ALL Generated Schema Files ---[/bold]")
@@ -420,7 +827,8 @@ def purge_all():
         console.input("\nPress Enter to continue.")
         return
 
-    files_to_delete = [os.path.join(DEFAULT_OUTPUT_DIR, f) for f in os.listdir(DEFAULT_OUTPUT_DIR) if (f.startswith("UserGameStatsSchema_") and f.endswith(".bin")) or re.match(r'UserGameStats_(\d+)_(\d+)\.bin', f)]
+    with os.scandir(DEFAULT_OUTPUT_DIR) as entries:
+        files_to_delete = [e.path for e in entries if is_generated_file_name(e.name) and e.is_file()]
     if not files_to_delete:
         console.print("[yellow]No generated schema or stats files found to delete.[/yellow]")
         console.input("\nPress Enter to continue.")
@@ -428,21 +836,15 @@ def purge_all():
 
     console.print(f"Found {len(files_to_delete)} generated files to delete in [cyan]{DEFAULT_OUTPUT_DIR}[/cyan]")
     console.print("\n[bold red]WARNING: This action is irreversible and will delete ALL generated schema and stats files.[/bold red]")
+    console.print(f"Cached Steam API responses in [cyan]{SCHEMA_CACHE_DIR}[/cyan] will be cleared as well.")
     choice = console.input("Are you sure you want to proceed? (y/n): ").lower()
 
     if choice == 'y':
-        # ... (deletion logic from before, converted to console.print)
-        deleted_count = 0
-        error_count = 0
-        for filepath in files_to_delete:
-            try:
-                os.remove(filepath)
-                deleted_count += 1
-            except OSError as e:
-                console.print(f"[bold red]Error deleting file {filepath}: {e}[/bold red]")
-                error_count += 1
-        console.print(f"\n[green]Successfully deleted {deleted_count} files.[/green]")
-        if error_count > 0: console.print(f"[bold red]Failed to delete {error_count} files.[/bold red]")
+        delete_files(files_to_delete)
+        if os.path.isdir(SCHEMA_CACHE_DIR):
+            with os.scandir(SCHEMA_CACHE_DIR) as entries:
+                cache_files = [e.path for e in entries if e.is_file()]
+            for cache_file in cache_files: try_unlink(cache_file)
     else:
         console.print("\n[yellow]Purge operation cancelled.[/yellow]")
     console.input("\nPress Enter to continue.")
@@ -450,12 +852,7 @@ def purge_all():
 def handle_purge_menu(steam_id):
     while True:
         clear()
-        console.print("\n[bold]--- Purge Generated Files Menu ---[/bold]")
-        console.print("1. Purge by manual App ID")
-        console.print("2. Purge based on SLSsteam config")
-        console.print("3. Purge based on Steam library")
-        console.print("4. Purge ALL generated files")
-        console.print("b. Back to main menu")
+        console.print(PURGE_MENU_TEXT)
         choice = console.input("\nSelect an option: ")
         if choice == '1': handle_purge_manual(steam_id)
         elif choice == '2': handle_purge_slssteam(steam_id)
@@ -464,22 +861,36 @@ def handle_purge_menu(steam_id):
         elif choice.lower() == 'b': break
         else: console.print("[bold red]Invalid option.[/bold red]"); console.input()
 
+def run_script(script_name):
+    """Runs one of the bundled shell scripts directly with bash (no intermediate shell)."""
+    try:
+        subprocess.run(["bash", script_name], check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return True
+    except (subprocess.CalledProcessError, OSError) as e:
+        console.print(f"[bold red]{script_name} failed: {e}[/bold red]")
+        return False
+
 def handle_update():
     clear()
     console.print("[bold cyan]Updating...[/bold cyan]")
-    os.system("bash install.sh")
-    console.print("\n[bold green]Update complete. Please restart the script.[/bold green]")
+    if run_script("install.sh"):
+        console.print("\n[bold green]Update complete. Please restart the script.[/bold green]")
     console.input("Press Enter to exit.")
 
 def handle_uninstall():
     clear()
-    os.system("bash uninstall.sh")
+    run_script("uninstall.sh")
     console.input("\nPress Enter to exit.")
 
 def main():
     """Main function of the script."""
-    if not check_internet_connection(): sys.exit(1)
+    # Probe connectivity in the background while the .env file loads; wait before any prompt.
+    internet_check = start_internet_check()
     load_dotenv(dotenv_path=DOTENV_PATH)
+    # Read after load_dotenv, so the flag also works when set in the .env file.
+    if os.environ.get("SLSAH_SKIP_NETCHECK") != "1" and not internet_check():
+        console.print("[bold red]No internet connection. Please check your network settings.[/bold red]")
+        sys.exit(1)
     api_key = os.getenv("STEAM_API_KEY")
     steam_id = os.getenv("STEAM_USER_ID")
     language = 'english' # Keep for API calls, but not user-changeable
@@ -488,6 +899,12 @@ def main():
         api_key = get_env_value("STEAM_API_KEY", "Steam API Key", "https://steamcommunity.com/dev/apikey")
         steam_id = get_env_value("STEAM_USER_ID", "Steam User ID", "https://steamid.io/", "[U:1:xxxxxxxxx]")
 
+    while not validate_api_key(api_key, steam_id):
+        console.print("[bold red]Steam rejected your API Key. Please enter a valid one.[/bold red]")
+        os.environ.pop("STEAM_API_KEY", None)
+        if os.path.exists(DOTENV_PATH): unset_key(DOTENV_PATH, "STEAM_API_KEY")
+        api_key = get_env_value("STEAM_API_KEY", "Steam API Key", "https://steamcommunity.com/dev/apikey")
+
     # Re-numbered and cleaned up menu items
     menu_items = {
         '-- Generation --': [
@@ -510,15 +927,16 @@ def main():
     
     all_options = {key: handler for group in menu_items.values() for key, _, handler in group}
 
+    menu_lines = ["[bold]--- Steam Achievement Helper ---[/bold]\n"]
+    for header, items in menu_items.items():
+        menu_lines.append(f"  [bold cyan]{header}[/bold cyan]")
+        menu_lines.extend(f"  [yellow]{key}[/yellow]. {text}" for key, text, _ in items)
+        menu_lines.append("") # Spacer
+    menu_text = "\n".join(menu_lines)
+
     while True:
         clear()
-        console.print(f"[bold]--- Steam Achievement Helper ---[/bold]\n")
-
-        for header, items in menu_items.items():
-            console.print(f"  [bold cyan]{header}[/bold cyan]")
-            for key, text, _ in items:
-                console.print(f"  [yellow]{key}[/yellow]. {text}")
-            console.print() # Spacer
+        console.print(menu_text)
 
         choice = console.input("Select an option ('q' for quit): ")
 
@@ -2,18 +2,102 @@ import os
 import json
 import requests
 import re
+import stat
+import threading
+from functools import lru_cache
+from contextlib import contextmanager, suppress
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv, set_key
 from rich.console import Console
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
 console = Console()
 
 CACHE_FILE_PATH = os.path.expanduser("~/.config/SLSsteam/appinfo_cache.json")
 DOTENV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
 
+# (connect, read) timeouts: fail fast on an unreachable host, but give large responses time to arrive.
+HTTP_TIMEOUT = (3.05, 30)
+MAX_DETAIL_WORKERS = 8
+# Connections kept per host by the shared session; concurrent fetchers are sized to match.
+HTTP_POOL_SIZE = 16
+
+# --- HTTP Session (connection pooling + retry on rate limit / server errors) ---
+# Shared by every Steam Web API and store request so TLS connections are reused across calls.
+session = requests.Session()
+# 429s honour Retry-After when sent, otherwise back off exponentially.
+_retry = Retry(total=5, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504],
+               respect_retry_after_header=True, raise_on_status=False)
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE, max_retries=_retry))
+
+# Precompiled input validation patterns
+_API_KEY_RE = re.compile(r'[a-fA-F0-9]{32}')
+_STEAMID_TAIL_RE = re.compile(r'(\d+)\]?\Z')
+
+def parse_json(content):
+    """Decodes a JSON payload (bytes or str), using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def dump_json(obj, pretty=False):
+    """Encodes obj to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(obj, indent=2 if pretty else None).encode()
+
+@contextmanager
+def open_atomic(path, buffering=-1, fsync=False):
+    """Opens a temp file for binary writing and renames it over path once the block completes."""
+    # Resolve symlinks so the link survives and its target is replaced.
+    path = os.path.realpath(path)
+    # Unique per process and thread, so concurrent writers never share a temp file.
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        with open(fd, 'wb', buffering=buffering) as f:
+            # Keep an existing file's permission bits; a new file gets the umask default.
+            with suppress(FileNotFoundError):
+                os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+            yield f
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with suppress(OSError): os.remove(tmp_path)
+        raise
+
+def load_yaml(stream):
+    """Safe-loads YAML from a binary stream, with libyaml's C loader when available."""
+    import yaml  # Imported on first use, so flows that never read YAML don't pay for it.
+    return yaml.load(stream, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+@lru_cache(maxsize=4)
+def _load_yaml_file(path, stat_key):
+    with open(path, 'rb') as f: return load_yaml(f)
+
+def read_yaml_file(path):
+    """Returns the parsed (shared, so don't modify it) YAML file at path, cached until the file changes."""
+    st = os.stat(path)
+    if not st.st_size: return None
+    # The inode catches same-size rewrites within one mtime tick: config writes always replace the file.
+    return _load_yaml_file(path, (st.st_ino, st.st_mtime_ns, st.st_size))
+
 def get_env_value(key, prompt, help_url="", example=""):
     """Gets a value from the .env file, or prompts the user for it if it doesn't exist."""
-    load_dotenv(dotenv_path=DOTENV_PATH)
     value = os.getenv(key)
+    if not value:
+        # main() loads the .env file at startup, so it only needs re-reading if the key is missing.
+        load_dotenv(dotenv_path=DOTENV_PATH)
+        value = os.getenv(key)
 
     while not value:
         console.print(f"\n[yellow]{prompt} not found.[/yellow]")
@@ -29,13 +113,13 @@ def get_env_value(key, prompt, help_url="", example=""):
             continue
 
         if key == "STEAM_API_KEY":
-            if not re.match(r'^[a-fA-F0-9]{32}$', value):
+            if not _API_KEY_RE.fullmatch(value):
                 console.print("[bold red]Invalid API Key format. It should be a 32-character hexadecimal string.[/bold red]")
                 value = None
                 continue
 
         if key == "STEAM_USER_ID":
-            match = re.search(r'(\d+)]?$', value)
+            match = _STEAMID_TAIL_RE.search(value)
             if match:
                 value = match.group(1)
         
@@ -53,8 +137,8 @@ def read_cache():
     if not os.path.exists(CACHE_FILE_PATH):
         return {}
     try:
-        with open(CACHE_FILE_PATH, 'r') as f:
-            return json.load(f)
+        with open(CACHE_FILE_PATH, 'rb') as f:
+            return parse_json(f.read())
     except (json.JSONDecodeError, Exception) as e:
         print(f"Warning: Could not read cache file. A new one will be created. Error: {e}")
         return {}
@@ -63,8 +147,9 @@ def write_cache(cache_data):
     """Writes data to the app details cache file."""
     try:
         os.makedirs(os.path.dirname(CACHE_FILE_PATH), exist_ok=True)
-        with open(CACHE_FILE_PATH, 'w') as f:
-            json.dump(cache_data, f, indent=4)
+        data = dump_json(cache_data, pretty=True)
+        with open_atomic(CACHE_FILE_PATH) as f:
+            f.write(data)
     except Exception as e:
         print(f"Warning: Could not write to cache file. Error: {e}")
 
@@ -75,15 +160,24 @@ def get_app_details(app_id, cache):
         return cache[app_id_str], False
     try:
         url = f"https://store.steampowered.com/api/appdetails?appids={app_id}"
-        response = requests.get(url, timeout=10)
+        response = session.get(url, timeout=HTTP_TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        data = parse_json(response.content)
         if app_id_str in data and data[app_id_str]['success']:
             app_data = data[app_id_str]['data']
             details = {'name': app_data.get('name', 'Unknown Name'), 'type': app_data.get('type', 'unknown')}
             cache[app_id_str] = details
             return details, True
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, ValueError) as e:
         # This is a soft failure, we don't want to interrupt the user for one failed lookup
         print(f"\nWarning: Could not fetch details for App ID {app_id}. Error: {e}")
     return None, False
+
+def iter_app_details(app_ids, cache):
+    """Yields get_app_details(app_id, cache) for each App ID, in order, fetching cache misses concurrently."""
+    with ThreadPoolExecutor(max_workers=MAX_DETAIL_WORKERS) as executor:
+        futures = {app_id: executor.submit(get_app_details, app_id, cache)
+                   for app_id in app_ids if str(app_id) not in cache}
+        for app_id in app_ids:
+            future = futures.get(app_id)
+            yield future.result() if future else (cache[str(app_id)], False)
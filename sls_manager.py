@@ -1,4 +1,3 @@
-import yaml
 import os
 import sys
 import re
@@ -6,14 +5,16 @@ import platform
 import requests
 import shutil
 import json
+import copy
 import time
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from rich.console import Console
 from rich.table import Table
 
 # Import the generator script to use its functions
 import generate_schema_from_api as achievement_generator
-from shared_utils import read_cache, write_cache, get_app_details, get_env_value, CACHE_FILE_PATH
+from shared_utils import read_cache, write_cache, iter_app_details, get_env_value, CACHE_FILE_PATH, read_yaml_file, open_atomic
 
 # --- Rich Console Initialization ---
 console = Console()
@@ -24,78 +25,99 @@ SLSSTEAM_CONFIG_PATH = os.path.join(SLSSTEAM_CONFIG_DIR, "config.yaml")
 BACKUP_DIR = os.path.join(SLSSTEAM_CONFIG_DIR, "backup")
 ONETIME_MSG_FLAG = os.path.join(SLSSTEAM_CONFIG_DIR, ".online_fix_msg_shown")
 SCHEMA_OUTPUT_DIR = os.path.expanduser("~/.steam/steam/appcache/stats")
+MENU_TEXT = "\n".join((
+    "\n[bold]--- SLSsteam Config Manager ---[/bold]\n",
+    "1. List Added Games/DLCs",
+    "2. Add a Game/DLC",
+    "3. Remove an Added Game/DLC",
+    "4. Manage Online Multiplayer Fix",
+    "5. Restore a Backup",
+    "6. Clear App Details Cache",
+    "m. Back to Main Menu",
+))
 
 
 
 # --- Basic Functions ---
 def clear():
-    """Clears the console screen."""
-    console.clear()
+    """Clears the console screen (a no-op when output is piped or redirected)."""
+    if console.is_terminal: console.clear()
 
 # --- YAML Helper Functions ---
 
 def read_yaml_section(section_key, default_value):
-    """Reads a specific top-level section from the YAML config."""
+    """Reads a specific top-level section from the YAML config (parsed once per file change)."""
     try:
-        with open(SLSSTEAM_CONFIG_PATH, 'r') as f:
-            config = yaml.safe_load(f)
-            if config and section_key in config and config[section_key] is not None:
-                return config[section_key]
+        config = read_yaml_file(SLSSTEAM_CONFIG_PATH)
+        if config and section_key in config and config[section_key] is not None:
+            # The parsed config is cached and shared, and callers edit the section they get back.
+            return copy.deepcopy(config[section_key])
     except FileNotFoundError:
         return default_value
-    except (yaml.YAMLError, Exception) as e:
+    except Exception as e:
         console.print(f"[bold red]Error reading or parsing YAML file: {e}[/bold red]")
         return None
     return default_value
 
-def write_yaml_section(section_key, new_data):
-    """Writes a list or dict to a specific section of the config file, preserving comments."""
+def _splice_yaml_section(lines, section_key, new_data):
+    """Replaces (or appends) one top-level section in a list of config lines, keeping the rest."""
+    if not lines:
+        lines = [f"{section_key}:\n"]
+
+    start_index = -1
+    for i, line in enumerate(lines):
+        if line.strip().startswith(f"{section_key}:"):
+            start_index = i
+            break
+    
+    if start_index == -1:
+        if lines and not lines[-1].endswith('\n'): lines.append('\n')
+        lines.extend([f"\n{section_key}:\n"])
+        start_index = len(lines) - 2
+    
+    indent_level = lines[start_index].find(section_key)
+    item_indent = ' ' * (indent_level + 2)
+    
+    new_data_lines = []
+    if isinstance(new_data, list):
+        new_data_lines = [f"{item_indent}- {item}\n" for item in sorted(set(new_data))]
+    elif isinstance(new_data, dict):
+        new_data_lines = [f"{item_indent}{key}: {value}\n" for key, value in sorted(new_data.items())]
+
+    # The section ends at the first non-blank line indented no deeper than its key.
+    end_index = start_index + 1
+    while end_index < len(lines):
+        line = lines[end_index]
+        if not line.strip() or len(line) - len(line.lstrip(' ')) <= indent_level: break
+        end_index += 1
+        
+    lines[start_index + 1:end_index] = new_data_lines
+    return lines
+
+def write_yaml_sections(sections):
+    """Writes several {section_key: list_or_dict} sections in one read and one rewrite, preserving comments."""
     try:
         try:
-            with open(SLSSTEAM_CONFIG_PATH, 'r') as f: lines = f.readlines()
+            with open(SLSSTEAM_CONFIG_PATH, 'r', encoding='utf-8') as f: lines = f.readlines()
         except FileNotFoundError: lines = []
 
-        if not lines:
-            lines = [f"{section_key}:\n"]
-
-        start_index = -1
-        for i, line in enumerate(lines):
-            if line.strip().startswith(f"{section_key}:"):
-                start_index = i
-                break
-        
-        if start_index == -1:
-            if lines and not lines[-1].endswith('\n'): lines.append('\n')
-            lines.extend([f"\n{section_key}:\n"])
-            start_index = len(lines) - 2
-        
-        indent_level = lines[start_index].find(section_key)
-        
-        new_data_lines = []
-        if isinstance(new_data, list):
-            for item in sorted(list(set(new_data))):
-                new_data_lines.append(f"{ ' ' * (indent_level + 2) }- {item}\n")
-        elif isinstance(new_data, dict):
-            for key, value in sorted(new_data.items()):
-                new_data_lines.append(f"{ ' ' * (indent_level + 2) }{key}: {value}\n")
-
-        end_index = start_index + 1
-        while end_index < len(lines):
-            line = lines[end_index]
-            is_section_item = line.strip() and (len(line) - len(line.lstrip(' '))) > indent_level
-            if not is_section_item: break
-            end_index += 1
-            
-        final_lines = lines[:start_index + 1] + new_data_lines + lines[end_index:]
+        for section_key, new_data in sections.items():
+            lines = _splice_yaml_section(lines, section_key, new_data)
 
         os.makedirs(os.path.dirname(SLSSTEAM_CONFIG_PATH), exist_ok=True)
-        with open(SLSSTEAM_CONFIG_PATH, 'w') as f: f.writelines(final_lines)
+        # Synced before the rename: this is the user's own config, not a rebuildable cache.
+        with open_atomic(SLSSTEAM_CONFIG_PATH, fsync=True) as f:
+            f.write(''.join(lines).encode('utf-8'))
         return True
 
     except Exception as e:
         console.print(f"[bold red]An error occurred during file write: {e}[/bold red]")
         return False
 
+def write_yaml_section(section_key, new_data):
+    """Writes a list or dict to a specific section of the config file, preserving comments."""
+    return write_yaml_sections({section_key: new_data})
+
 # --- Common Helper Functions ---
 
 def backup_config():
@@ -114,11 +136,13 @@ def get_all_app_details(cache, app_ids):
     if not app_ids: return [], False
     app_details_list = []
     cache_modified = False
+    total = len(app_ids)
     with console.status("[bold green]Loading app details...[/bold green]") as status:
-        for i, app_id in enumerate(app_ids):
-            status.update(f"Loading details for [cyan]{app_id}[/cyan] ({i+1}/{len(app_ids)})")
-            details, modified = get_app_details(app_id, cache)
-            if modified: cache_modified = True
+        for i, (app_id, (details, modified)) in enumerate(zip(app_ids, iter_app_details(app_ids, cache)), 1):
+            # Cache hits come back instantly, so only fetched entries move the status line.
+            if modified:
+                status.update(f"Loading details for [cyan]{app_id}[/cyan] ({i}/{total})")
+                cache_modified = True
             app_details_list.append({'id': app_id, 'name': details['name'] if details else 'Unknown App', 'type': details['type'] if details else 'unknown'})
     return app_details_list, cache_modified
 
@@ -179,6 +203,8 @@ def handle_add_game(cache):
             api_key = get_env_value("STEAM_API_KEY", "Steam API Key", "https://steamcommunity.com/dev/apikey")
             steam_id = get_env_value("STEAM_USER_ID", "Steam User ID", "https://steamid.io/", "[U:1:xxxxxxxxx]")
             
+            # Online fixes are collected and written once after the loop, not one config rewrite per app.
+            online_fix_apps = []
             for app in app_details_list:
                 clear()
                 console.rule(f"[bold]Post-add options for {app['name']}[/bold]")
@@ -191,10 +217,13 @@ def handle_add_game(cache):
                 clear()
                 console.rule(f"[bold]Post-add options for {app['name']}[/bold]")
                 if console.input(f"Attempt to enable online multiplayer for [cyan]{app['name']}[/cyan]? (y/n): ").lower() == 'y':
-                    overrides = read_yaml_section('FakeAppIds', {})
-                    overrides[app['id']] = 480
-                    if write_yaml_section('FakeAppIds', overrides):
-                        console.print(f"[green]Successfully added online fix for {app['name']}.[/green]")
+                    online_fix_apps.append(app)
+
+            if online_fix_apps:
+                overrides = read_yaml_section('FakeAppIds', {})
+                for app in online_fix_apps: overrides[app['id']] = 480
+                if write_yaml_section('FakeAppIds', overrides):
+                    console.print("\n".join(f"[green]Successfully added online fix for {app['name']}.[/green]" for app in online_fix_apps))
             inform_manual_restart()
         else:
             console.print("[bold red]Failed to write to config file.[/bold red]")
@@ -208,20 +237,25 @@ def delete_schema_files(app_ids_to_remove, steam_id):
         console.print("[yellow]Could not determine Steam User ID. Skipping schema file deletion.[/yellow]")
         return 0
     
-    deleted_count = 0
+    file_paths = []
     for app_id in app_ids_to_remove:
         app_id_str = str(app_id)
-        schema_file = os.path.join(SCHEMA_OUTPUT_DIR, f"UserGameStatsSchema_{app_id_str}.bin")
-        stats_file = os.path.join(SCHEMA_OUTPUT_DIR, f"UserGameStats_{steam_id}_{app_id_str}.bin")
-        
-        for file_path in [schema_file, stats_file]:
-            if os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                    console.print(f"Removed {os.path.basename(file_path)}")
-                    deleted_count += 1
-                except OSError as e:
-                    console.print(f"[bold red]Error deleting file {os.path.basename(file_path)}: {e}[/bold red]")
+        file_paths.append(os.path.join(SCHEMA_OUTPUT_DIR, f"UserGameStatsSchema_{app_id_str}.bin"))
+        file_paths.append(os.path.join(SCHEMA_OUTPUT_DIR, f"UserGameStats_{steam_id}_{app_id_str}.bin"))
+
+    # Unlink in parallel; a missing file just means there was nothing to remove.
+    # Per-file results are printed as one block rather than one console.print per file.
+    deleted_count = 0
+    messages = []
+    with ThreadPoolExecutor(max_workers=achievement_generator.MAX_DELETE_WORKERS) as executor:
+        for file_path, error in zip(file_paths, executor.map(achievement_generator.try_unlink, file_paths)):
+            if error is None:
+                messages.append(f"Removed {os.path.basename(file_path)}")
+                deleted_count += 1
+            elif not isinstance(error, FileNotFoundError):
+                messages.append(f"[bold red]Error deleting file {os.path.basename(file_path)}: {error}[/bold red]")
+    if messages:
+        console.print("\n".join(messages))
     return deleted_count
 
 def handle_remove_game(cache):
@@ -302,6 +336,9 @@ def handle_remove_game(cache):
 
         if not backup_config(): console.input(); continue
         
+        # Both sections are written together at the end, in a single config rewrite.
+        sections = {}
+
         # Ask about online fix
         online_fixes_removed = False
         overrides = read_yaml_section('FakeAppIds', {})
@@ -310,9 +347,8 @@ def handle_remove_game(cache):
             if console.input(f"\nAlso remove online multiplayer fix for these {len(overrides_to_remove)} game(s)? (y/n): ").lower() == 'y':
                 for app_id in overrides_to_remove:
                     del overrides[app_id]
-                write_yaml_section('FakeAppIds', overrides)
+                sections['FakeAppIds'] = overrides
                 online_fixes_removed = True
-                console.print(f"[green]Removed {len(overrides_to_remove)} online fix(es).[/green]")
 
         # Ask about schema files
         schemas_removed = False
@@ -324,8 +360,10 @@ def handle_remove_game(cache):
                 console.print(f"[green]Removed {deleted_count} schema file(s).[/green]")
 
         # Remove from AdditionalApps
-        final_app_ids = [id for id in current_app_ids if id not in ids_to_remove]
-        write_yaml_section('AdditionalApps', final_app_ids)
+        sections['AdditionalApps'] = [id for id in current_app_ids if id not in ids_to_remove]
+        write_yaml_sections(sections)
+        if online_fixes_removed:
+            console.print(f"[green]Removed {len(overrides_to_remove)} online fix(es).[/green]")
         console.print(f"\n[green]Successfully removed {len(ids_to_remove)} game(s) from the 'AdditionalApps' list.[/green]")
 
         if online_fixes_removed or schemas_removed:
@@ -454,35 +492,33 @@ def main():
     os.makedirs(SLSSTEAM_CONFIG_DIR, exist_ok=True)
     cache = read_cache()
     cache_modified = False
+    # Handlers add fetched details to the cache as they go, so a size change also catches
+    # additions from a handler that was interrupted before it could report them.
+    initial_cache_size = len(cache)
 
-    while True:
-        clear()
-        console.print("\n[bold]--- SLSsteam Config Manager ---[/bold]\n")
-        console.print("1. List Added Games/DLCs")
-        console.print("2. Add a Game/DLC")
-        console.print("3. Remove an Added Game/DLC")
-        console.print("4. Manage Online Multiplayer Fix")
-        console.print("5. Restore a Backup")
-        console.print("6. Clear App Details Cache")
-        console.print("m. Back to Main Menu")
-        choice = console.input("\nSelect an option: ")
-
-        result = False
-        if choice == '1': result = handle_list_added_games(cache)
-        elif choice == '2': result = handle_add_game(cache)
-        elif choice == '3': result = handle_remove_game(cache)
-        elif choice == '4': result = handle_online_fix_menu(cache)
-        elif choice == '5': handle_restore_backup()
-        elif choice == '6': handle_clear_cache()
-        elif choice.lower() in ['m', 'q']: break
-        else: console.print("[bold red]Invalid option.[/bold red]"); console.input()
-        
-        if result == "main_menu": break
-        if result is True: cache_modified = True
-    
-    if cache_modified:
-        console.print("Saving app details to cache...")
-        write_cache(cache)
+    # The cache is written once, on the way out, even if the session ends with Ctrl+C.
+    try:
+        while True:
+            clear()
+            console.print(MENU_TEXT)
+            choice = console.input("\nSelect an option: ")
+
+            result = False
+            if choice == '1': result = handle_list_added_games(cache)
+            elif choice == '2': result = handle_add_game(cache)
+            elif choice == '3': result = handle_remove_game(cache)
+            elif choice == '4': result = handle_online_fix_menu(cache)
+            elif choice == '5': handle_restore_backup()
+            elif choice == '6': handle_clear_cache()
+            elif choice.lower() in ['m', 'q']: break
+            else: console.print("[bold red]Invalid option.[/bold red]"); console.input()
+
+            if result == "main_menu": break
+            if result is True: cache_modified = True
+    finally:
+        if cache_modified or len(cache) != initial_cache_size:
+            console.print("Saving app details to cache...")
+            write_cache(cache)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
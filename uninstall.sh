@@ -4,6 +4,7 @@
 INSTALL_DIR="$HOME/steam-schema-generator"
 DESKTOP_SHORTCUT_PATH="$HOME/Desktop/steam-schema-generator.desktop"
 STATS_DIR="$HOME/.steam/steam/appcache/stats"
+SCHEMA_CACHE_DIR="$HOME/.cache/SLSsteam/schemas"
 
 echo "This script will remove the Steam Schema Generator and its files."
 read -p "Are you sure you want to continue? (y/n) " -n 1 -r
@@ -31,5 +32,6 @@ echo ""
 echo "The generated schema and stats files are located in:"
 echo "$STATS_DIR"
 echo "These files have not been deleted. You can remove them manually if you wish."
+echo "Cached Steam API responses are kept in $SCHEMA_CACHE_DIR and can be removed the same way."
 
 echo "Uninstallation complete."
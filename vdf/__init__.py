@@ -310,8 +310,111 @@ def binary_loads(b, mapper=dict, merge_duplicate_keys=True, alt_format=False, ra
     """
     if not isinstance(b, bytes):
         raise TypeError("Expected s to be bytes, got %s" % type(b))
+    if not issubclass(mapper, Mapping):
+        raise TypeError("Expected mapper to be subclass of dict, got %s" % type(mapper))
+
+    return _binary_loads_buffer(b, mapper, merge_duplicate_keys, alt_format, raise_on_remaining)
+
+def _binary_loads_buffer(b, mapper, merge_duplicate_keys, alt_format, raise_on_remaining):
+    """
+    Same format as ``binary_load``, but indexes directly into ``b`` with ``find()``
+    and ``unpack_from()`` instead of reading through a file object byte by byte.
+    """
+    # helpers
+    int32 = struct.Struct('<i')
+    uint64 = struct.Struct('<Q')
+    int64 = struct.Struct('<q')
+    float32 = struct.Struct('<f')
+    find = b.find
+
+    if bytes is not str:
+        def read_string(pos):
+            end = find(b'\x00', pos)
+
+            if end == -1:
+                raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+
+            return b[pos:end].decode('utf-8', 'replace'), end + 1
+    else:
+        def read_string(pos):
+            end = find(b'\x00', pos)
+
+            if end == -1:
+                raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+
+            result = b[pos:end]
+            try:
+                result.decode('ascii')
+            except:
+                result = result.decode('utf-8', 'replace')
+
+            return result, end + 1
+
+    def read_wide_string(pos):
+        end = find(b'\x00\x00', pos)
+
+        if end == -1:
+            raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+
+        end += (end - pos) % 2
+
+        return b[pos:end].decode('utf-16'), end + 2
+
+    stack = [mapper()]
+    top = stack[-1]
+    CURRENT_BIN_END = BIN_END if not alt_format else BIN_END_ALT
+    pos, length = 0, len(b)
+
+    while pos < length:
+        t = b[pos:pos+1]
+        pos += 1
+
+        if t == CURRENT_BIN_END:
+            if len(stack) > 1:
+                stack.pop()
+                top = stack[-1]
+                continue
+            break
+
+        key, pos = read_string(pos)
+
+        if t == BIN_NONE:
+            if merge_duplicate_keys and key in top:
+                _m = top[key]
+            else:
+                _m = mapper()
+                top[key] = _m
+            stack.append(_m)
+            top = _m
+        elif t == BIN_STRING:
+            top[key], pos = read_string(pos)
+        elif t == BIN_INT32:
+            top[key] = int32.unpack_from(b, pos)[0]
+            pos += int32.size
+        elif t == BIN_WIDESTRING:
+            top[key], pos = read_wide_string(pos)
+        elif t in (BIN_POINTER, BIN_COLOR):
+            val = int32.unpack_from(b, pos)[0]
+            pos += int32.size
+            top[key] = POINTER(val) if t == BIN_POINTER else COLOR(val)
+        elif t == BIN_UINT64:
+            top[key] = UINT_64(uint64.unpack_from(b, pos)[0])
+            pos += uint64.size
+        elif t == BIN_INT64:
+            top[key] = INT_64(int64.unpack_from(b, pos)[0])
+            pos += int64.size
+        elif t == BIN_FLOAT32:
+            top[key] = float32.unpack_from(b, pos)[0]
+            pos += float32.size
+        else:
+            raise SyntaxError("Unknown data type at offset %d: %s" % (pos - 1, repr(t)))
+
+    if len(stack) != 1:
+        raise SyntaxError("Reached EOF, but Binary VDF is incomplete")
+    if raise_on_remaining and pos < length:
+        raise SyntaxError("Binary VDF ended at offset %d, but there is more data remaining" % (pos - 1))
 
-    return binary_load(BytesIO(b), mapper, merge_duplicate_keys, alt_format, raise_on_remaining)
+    return stack.pop()
 
 def binary_load(fp, mapper=dict, merge_duplicate_keys=True, alt_format=False, raise_on_remaining=False):
     """
@@ -438,8 +541,9 @@ def binary_dump(obj, fp, alt_format=False):
     if not hasattr(fp, 'write'):
         raise TypeError("Expected fp to have write() method")
 
+    write = fp.write
     for chunk in _binary_dump_gen(obj, alt_format=alt_format):
-        fp.write(chunk)
+        write(chunk)
 
 def _binary_dump_gen(obj, level=0, alt_format=False):
     if level == 0 and len(obj) == 0: